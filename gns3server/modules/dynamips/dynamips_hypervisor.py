@@ -51,7 +51,7 @@ class DynamipsHypervisor:
         self._host = host
         self._port = port
 
-        self._devices = []
+        self._devices = set()
         self._working_dir = working_dir
         self._version = "N/A"
         self._timeout = timeout
@@ -187,9 +187,9 @@ class DynamipsHypervisor:
     @property
     def devices(self):
         """
-        Returns the list of devices managed by this hypervisor instance.
+        Returns the devices managed by this hypervisor instance.
 
-        :returns: a list of device instances
+        :returns: a set of device instances
         """
 
         return self._devices
@@ -234,12 +234,26 @@ class DynamipsHypervisor:
 
         self._host = host
 
+    @staticmethod
+    def _encode(command):
+        """
+        Encodes a command to be sent to the hypervisor.
+
+        :param command: a Dynamips hypervisor command (string or bytes)
+
+        :returns: newline terminated command (bytes)
+        """
+
+        if isinstance(command, str):
+            command = command.encode()
+        return command.strip() + b'\n'
+
     @asyncio.coroutine
     def send(self, command):
         """
         Sends commands to this hypervisor.
 
-        :param command: a Dynamips hypervisor command
+        :param command: a Dynamips hypervisor command (string or already encoded bytes)
 
         :returns: results as a list
         """
@@ -262,61 +276,115 @@ class DynamipsHypervisor:
                 raise DynamipsError("Not connected")
 
             try:
-                command = command.strip() + '\n'
-                log.debug("sending {}".format(command))
-                self._writer.write(command.encode())
+                log.debug("sending %s", command)
+                self._writer.write(self._encode(command))
                 yield from self._writer.drain()
             except OSError as e:
                 raise DynamipsError("Lost communication with {host}:{port} :{error}, Dynamips process running: {run}"
                                     .format(host=self._host, port=self._port, error=e, run=self.is_running()))
 
-            # Now retrieve the result
-            data = []
-            buf = ''
-            while True:
+            return (yield from self._read_result())
+
+    @asyncio.coroutine
+    def send_many(self, commands, return_exceptions=False):
+        """
+        Sends several commands to this hypervisor in a single write
+        and then reads back one result for each command.
+
+        All the results are always read in order to keep the connection
+        in sync. By default the first error (if any) is raised afterwards,
+        with return_exceptions set the error of each failed command is
+        returned in place of its result.
+
+        :param commands: list of Dynamips hypervisor commands (strings or already encoded bytes)
+        :param return_exceptions: return errors instead of raising them
+
+        :returns: list of results (one list or DynamipsError instance for each command)
+        """
+
+        if not commands:
+            return []
+
+        with (yield from self._io_lock):
+            if self._writer is None or self._reader is None:
+                raise DynamipsError("Not connected")
+
+            try:
+                log.debug("sending %s", commands)
+                self._writer.write(b"".join(self._encode(command) for command in commands))
+                yield from self._writer.drain()
+            except OSError as e:
+                raise DynamipsError("Lost communication with {host}:{port} :{error}, Dynamips process running: {run}"
+                                    .format(host=self._host, port=self._port, error=e, run=self.is_running()))
+
+            results = []
+            for _ in commands:
                 try:
-                    try:
-                        line = yield from self._reader.readline()
-                    except asyncio.CancelledError:
-                        # task has been canceled but continue to read
-                        # any remaining data sent by the hypervisor
-                        continue
-                    if not line:
-                        raise DynamipsError("No data returned from {host}:{port}, Dynamips process running: {run}"
-                                            .format(host=self._host, port=self._port, run=self.is_running()))
-                    buf += line.decode()
-                except OSError as e:
-                    raise DynamipsError("Lost communication with {host}:{port} :{error}, Dynamips process running: {run}"
-                                        .format(host=self._host, port=self._port, error=e, run=self.is_running()))
-
-                # If the buffer doesn't end in '\n' then we can't be done
+                    results.append((yield from self._read_result()))
+                except DynamipsError as e:
+                    results.append(e)
+
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, DynamipsError):
+                    raise result
+        return results
+
+    @asyncio.coroutine
+    def _read_result(self):
+        """
+        Reads the result of one command sent to this hypervisor.
+        Must be called with the I/O lock held.
+
+        :returns: results as a list
+        """
+
+        data = []
+        buf = ''
+        while True:
+            try:
                 try:
-                    if buf[-1] != '\n':
-                        continue
-                except IndexError:
-                    raise DynamipsError("Could not communicate with {host}:{port}, Dynamips process running: {run}"
+                    line = yield from self._reader.readline()
+                except asyncio.CancelledError:
+                    # task has been canceled but continue to read
+                    # any remaining data sent by the hypervisor
+                    continue
+                if not line:
+                    raise DynamipsError("No data returned from {host}:{port}, Dynamips process running: {run}"
                                         .format(host=self._host, port=self._port, run=self.is_running()))
+                buf += line.decode()
+            except OSError as e:
+                raise DynamipsError("Lost communication with {host}:{port} :{error}, Dynamips process running: {run}"
+                                    .format(host=self._host, port=self._port, error=e, run=self.is_running()))
 
-                data += buf.split('\r\n')
-                if data[-1] == '':
+            # If the buffer doesn't end in '\n' then we can't be done
+            try:
+                if buf[-1] != '\n':
+                    continue
+            except IndexError:
+                raise DynamipsError("Could not communicate with {host}:{port}, Dynamips process running: {run}"
+                                    .format(host=self._host, port=self._port, run=self.is_running()))
+
+            data += buf.split('\r\n')
+            if data[-1] == '':
+                data.pop()
+            buf = ''
+
+            # Does it contain an error code?
+            if self.error_re.search(data[-1]):
+                raise DynamipsError(data[-1][4:])
+
+            # Or does the last line begin with '100-'? Then we are done!
+            if data[-1][:4] == '100-':
+                data[-1] = data[-1][4:]
+                if data[-1] == 'OK':
                     data.pop()
-                buf = ''
-
-                # Does it contain an error code?
-                if self.error_re.search(data[-1]):
-                    raise DynamipsError(data[-1][4:])
-
-                # Or does the last line begin with '100-'? Then we are done!
-                if data[-1][:4] == '100-':
-                    data[-1] = data[-1][4:]
-                    if data[-1] == 'OK':
-                        data.pop()
-                    break
-
-            # Remove success responses codes
-            for index in range(len(data)):
-                if self.success_re.search(data[index]):
-                    data[index] = data[index][4:]
-
-            log.debug("returned result {}".format(data))
-            return data
+                break
+
+        # Remove success responses codes
+        for index in range(len(data)):
+            if self.success_re.search(data[index]):
+                data[index] = data[index][4:]
+
+        log.debug("returned result {}".format(data))
+        return data
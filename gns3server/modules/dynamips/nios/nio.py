@@ -42,6 +42,7 @@ class NIO:
         self._bandwidth = None  # no bandwidth constraint by default
         self._input_filter = None  # no input filter applied by default
         self._output_filter = None  # no output filter applied by default
+        self._filters_applied = False  # both input and output filters are applied
         self._input_filter_options = None  # no input filter options by default
         self._output_filter_options = None  # no output filter options by default
         self._dynamips_direction = {"in": 0, "out": 1, "both": 2}
@@ -91,24 +92,49 @@ class NIO:
 
         yield from self._hypervisor.send("nio set_debug {name} {debug}".format(name=self._name, debug=debug))
 
-    @asyncio.coroutine
-    def bind_filter(self, direction, filter_name):
+    def _bind_filter_command(self, direction, filter_name):
         """
-        Adds a packet filter to this NIO.
-        Filter "freq_drop" drops packets.
-        Filter "capture" captures packets.
+        Builds the hypervisor command to add a packet filter to this NIO.
 
         :param direction: "in", "out" or "both"
         :param filter_name: name of the filter to apply
+
+        :returns: hypervisor command (string)
         """
 
         if direction not in self._dynamips_direction:
             raise DynamipsError("Unknown direction {} to bind filter {}:".format(direction, filter_name))
         dynamips_direction = self._dynamips_direction[direction]
 
-        yield from self._hypervisor.send("nio bind_filter {name} {direction} {filter}".format(name=self._name,
-                                                                                              direction=dynamips_direction,
-                                                                                              filter=filter_name))
+        return "nio bind_filter {name} {direction} {filter}".format(name=self._name,
+                                                                    direction=dynamips_direction,
+                                                                    filter=filter_name)
+
+    def _setup_filter_command(self, direction, options):
+        """
+        Builds the hypervisor command to setup a packet filter bound with this NIO.
+
+        :param direction: "in", "out" or "both"
+        :param options: options for the packet filter (string)
+
+        :returns: hypervisor command (string)
+        """
+
+        if direction not in self._dynamips_direction:
+            raise DynamipsError("Unknown direction {} to setup filter:".format(direction))
+        dynamips_direction = self._dynamips_direction[direction]
+
+        return "nio setup_filter {name} {direction} {options}".format(name=self._name,
+                                                                      direction=dynamips_direction,
+                                                                      options=options)
+
+    def _set_filter(self, direction, filter_name):
+        """
+        Records the packet filter applied to this NIO.
+
+        :param direction: "in", "out" or "both"
+        :param filter_name: name of the filter or None
+        """
 
         if direction == "in":
             self._input_filter = filter_name
@@ -117,6 +143,37 @@ class NIO:
         elif direction == "both":
             self._input_filter = filter_name
             self._output_filter = filter_name
+        self._filters_applied = self._input_filter is not None and self._output_filter is not None
+
+    def _set_filter_options(self, direction, options):
+        """
+        Records the options of the packet filter applied to this NIO.
+
+        :param direction: "in", "out" or "both"
+        :param options: options for the packet filter (string)
+        """
+
+        if direction == "in":
+            self._input_filter_options = options
+        elif direction == "out":
+            self._output_filter_options = options
+        elif direction == "both":
+            self._input_filter_options = options
+            self._output_filter_options = options
+
+    @asyncio.coroutine
+    def bind_filter(self, direction, filter_name):
+        """
+        Adds a packet filter to this NIO.
+        Filter "freq_drop" drops packets.
+        Filter "capture" captures packets.
+
+        :param direction: "in", "out" or "both"
+        :param filter_name: name of the filter to apply
+        """
+
+        yield from self._hypervisor.send(self._bind_filter_command(direction, filter_name))
+        self._set_filter(direction, filter_name)
 
     @asyncio.coroutine
     def unbind_filter(self, direction):
@@ -133,13 +190,7 @@ class NIO:
         yield from self._hypervisor.send("nio unbind_filter {name} {direction}".format(name=self._name,
                                                                                        direction=dynamips_direction))
 
-        if direction == "in":
-            self._input_filter = None
-        elif direction == "out":
-            self._output_filter = None
-        elif direction == "both":
-            self._input_filter = None
-            self._output_filter = None
+        self._set_filter(direction, None)
 
     @asyncio.coroutine
     def setup_filter(self, direction, options):
@@ -160,21 +211,31 @@ class NIO:
         :param options: options for the packet filter (string)
         """
 
-        if direction not in self._dynamips_direction:
-            raise DynamipsError("Unknown direction {} to setup filter:".format(direction))
-        dynamips_direction = self._dynamips_direction[direction]
+        yield from self._hypervisor.send(self._setup_filter_command(direction, options))
+        self._set_filter_options(direction, options)
+
+    @asyncio.coroutine
+    def bind_and_setup_filter(self, direction, filter_name, options):
+        """
+        Adds a packet filter to this NIO and setups it
+        with a single hypervisor round-trip.
 
-        yield from self._hypervisor.send("nio setup_filter {name} {direction} {options}".format(name=self._name,
-                                                                                                direction=dynamips_direction,
-                                                                                                options=options))
+        :param direction: "in", "out" or "both"
+        :param filter_name: name of the filter to apply
+        :param options: options for the packet filter (string)
+        """
 
-        if direction == "in":
-            self._input_filter_options = options
-        elif direction == "out":
-            self._output_filter_options = options
-        elif direction == "both":
-            self._input_filter_options = options
-            self._output_filter_options = options
+        bind_result, setup_result = yield from self._hypervisor.send_many([self._bind_filter_command(direction, filter_name),
+                                                                           self._setup_filter_command(direction, options)],
+                                                                          return_exceptions=True)
+
+        # the filter is bound even if it could not be setup
+        if isinstance(bind_result, DynamipsError):
+            raise bind_result
+        self._set_filter(direction, filter_name)
+        if isinstance(setup_result, DynamipsError):
+            raise setup_result
+        self._set_filter_options(direction, options)
 
     @property
     def input_filter(self):
@@ -196,6 +257,16 @@ class NIO:
 
         return self._output_filter, self._output_filter_options
 
+    @property
+    def filters_applied(self):
+        """
+        Returns whether packet filters are applied in both directions.
+
+        :returns: boolean
+        """
+
+        return self._filters_applied
+
     @asyncio.coroutine
     def get_stats(self):
         """
@@ -22,6 +22,7 @@ http://github.com/GNS3/dynamips/blob/master/README.hypervisor#L593
 
 import asyncio
 import re
+import types
 
 from .device import Device
 from ..nios.nio_udp import NIOUDP
@@ -30,6 +31,19 @@ from ..dynamips_error import DynamipsError
 import logging
 log = logging.getLogger(__name__)
 
+# hypervisor commands to create or delete virtual connections
+_VPC_CREATE = 'atmsw create_vpc "%s" %s %s %s %s'
+_VPC_DELETE = 'atmsw delete_vpc "%s" %s %s %s %s'
+_VCC_CREATE = 'atmsw create_vcc "%s" %s %s %s %s %s %s'
+_VCC_DELETE = 'atmsw delete_vcc "%s" %s %s %s %s %s %s'
+
+# Dynamips link type names for the usual PCAP data link types
+_DLT_NAMES = {"DLT_ATM_RFC1483": "atm_rfc1483",
+              "DLT_EN10MB": "en10mb",
+              "DLT_FRELAY": "frelay",
+              "DLT_C_HDLC": "c_hdlc",
+              "DLT_PPP_SERIAL": "ppp_serial"}
+
 
 class ATMSwitch(Device):
 
@@ -43,18 +57,25 @@ class ATMSwitch(Device):
     :param hypervisor: Dynamips hypervisor instance
     """
 
+    __slots__ = ("_nios", "_mappings", "_port_mappings", "_inflight")
+
+    # shared read-only table, replaced by a real dict on first write
+    _EMPTY = types.MappingProxyType({})
+
     def __init__(self, name, device_id, project, manager, hypervisor=None):
 
         super().__init__(name, device_id, project, manager, hypervisor)
-        self._nios = {}
-        self._mappings = {}
+        self._nios = self._EMPTY
+        self._mappings = self._EMPTY
+        self._port_mappings = self._EMPTY  # port number -> mapping sources on that port
+        self._inflight = self._EMPTY
 
     def __json__(self):
 
         return {"name": self.name,
                 "device_id": self.id,
                 "project_id": self.project.id,
-                "mappings": self._mappings}
+                "mappings": dict(self._mappings)}
 
     @asyncio.coroutine
     def create(self):
@@ -64,8 +85,8 @@ class ATMSwitch(Device):
             self._hypervisor = yield from self.manager.start_new_hypervisor(working_dir=module_workdir)
 
         yield from self._hypervisor.send('atmsw create "{}"'.format(self._name))
-        log.info('ATM switch "{name}" [{id}] has been created'.format(name=self._name, id=self._id))
-        self._hypervisor.devices.append(self)
+        log.info('ATM switch "%s" [%s] has been created', self._name, self._id)
+        self._hypervisor.devices.add(self)
 
     @asyncio.coroutine
     def set_name(self, new_name):
@@ -76,9 +97,7 @@ class ATMSwitch(Device):
         """
 
         yield from self._hypervisor.send('atm rename "{name}" "{new_name}"'.format(name=self._name, new_name=new_name))
-        log.info('ATM switch "{name}" [{id}]: renamed to "{new_name}"'.format(name=self._name,
-                                                                              id=self._id,
-                                                                              new_name=new_name))
+        log.info('ATM switch "%s" [%s]: renamed to "%s"', self._name, self._id, new_name)
         self._name = new_name
 
     @property
@@ -113,11 +132,11 @@ class ATMSwitch(Device):
 
         try:
             yield from self._hypervisor.send('atmsw delete "{}"'.format(self._name))
-            log.info('ATM switch "{name}" [{id}] has been deleted'.format(name=self._name, id=self._id))
+            log.info('ATM switch "%s" [%s] has been deleted', self._name, self._id)
         except DynamipsError:
-            log.debug("Could not properly delete ATM switch {}".format(self._name))
-        if self._hypervisor and self in self._hypervisor.devices:
-            self._hypervisor.devices.remove(self)
+            log.debug("Could not properly delete ATM switch %s", self._name)
+        if self._hypervisor:
+            self._hypervisor.devices.discard(self)
         if self._hypervisor and not self._hypervisor.devices:
             yield from self.hypervisor.stop()
 
@@ -128,9 +147,18 @@ class ATMSwitch(Device):
         :returns: boolean
         """
 
-        if port in self._nios:
-            return True
-        return False
+        return port in self._nios
+
+    def validate_ports(self, ports):
+        """
+        Finds the ports that are not allocated on this ATM switch.
+
+        :param ports: iterable of port numbers
+
+        :returns: set of missing port numbers
+        """
+
+        return set(ports) - self._nios.keys()
 
     def add_nio(self, nio, port_number):
         """
@@ -143,11 +171,10 @@ class ATMSwitch(Device):
         if port_number in self._nios:
             raise DynamipsError("Port {} isn't free".format(port_number))
 
-        log.info('ATM switch "{name}" [id={id}]: NIO {nio} bound to port {port}'.format(name=self._name,
-                                                                                        id=self._id,
-                                                                                        nio=nio,
-                                                                                        port=port_number))
+        log.info('ATM switch "%s" [id=%s]: NIO %s bound to port %s', self._name, self._id, nio, port_number)
 
+        if self._nios is self._EMPTY:
+            self._nios = {}
         self._nios[port_number] = nio
 
     @asyncio.coroutine
@@ -158,33 +185,42 @@ class ATMSwitch(Device):
         :param port_number: allocated port number
         """
 
-        if port_number not in self._nios:
+        nio = self._nios.get(port_number)
+        if nio is None:
             raise DynamipsError("Port {} is not allocated".format(port_number))
 
         # remove VCs mapped with the port
-        for source, destination in self._mappings.copy().items():
+        pvcs = []
+        vps = []
+        queued = set()
+        for source in self._port_mappings.get(port_number, ()):
+            if source in queued:
+                # reverse of a connection looped back on this port
+                continue
+            destination = self._mappings[source]
+            # the reverse connection may already be gone after a partial failure
+            # and there is none for a connection mapped onto itself
+            reverse = destination != source and self._mappings.get(destination) == source
+            queued.add(source)
+            if reverse:
+                queued.add(destination)
             if len(source) == 3 and len(destination) == 3:
                 # remove the virtual channels mapped with this port/nio
-                source_port, source_vpi, source_vci = source
-                destination_port, destination_vpi, destination_vci = destination
-                if port_number == source_port:
-                    yield from self.unmap_pvc(source_port, source_vpi, source_vci, destination_port, destination_vpi, destination_vci)
-                    yield from self.unmap_pvc(destination_port, destination_vpi, destination_vci, source_port, source_vpi, source_vci)
+                pvcs.append(source + destination)
+                if reverse:
+                    pvcs.append(destination + source)
             else:
                 # remove the virtual paths mapped with this port/nio
-                source_port, source_vpi = source
-                destination_port, destination_vpi = destination
-                if port_number == source_port:
-                    yield from self.unmap_vp(source_port, source_vpi, destination_port, destination_vpi)
-                    yield from self.unmap_vp(destination_port, destination_vpi, source_port, source_vpi)
+                vps.append(source + destination)
+                if reverse:
+                    vps.append(destination + source)
+
+        yield from self.unmap_pvc_bulk(pvcs)
+        yield from self.unmap_vp_bulk(vps)
 
-        nio = self._nios[port_number]
         if isinstance(nio, NIOUDP):
             self.manager.port_manager.release_udp_port(nio.lport, self._project)
-        log.info('ATM switch "{name}" [{id}]: NIO {nio} removed from port {port}'.format(name=self._name,
-                                                                                         id=self._id,
-                                                                                         nio=nio,
-                                                                                         port=port_number))
+        log.info('ATM switch "%s" [%s]: NIO %s removed from port %s', self._name, self._id, nio, port_number)
 
         del self._nios[port_number]
         return nio
@@ -198,26 +234,193 @@ class ATMSwitch(Device):
         """
 
         pvc_entry = re.compile(r"""^([0-9]*):([0-9]*):([0-9]*)$""")
+        pvcs = []
+        vps = []
+        queued = set()
         for source, destination in mappings.items():
             match_source_pvc = pvc_entry.search(source)
             match_destination_pvc = pvc_entry.search(destination)
             if match_source_pvc and match_destination_pvc:
                 # add the virtual channels
-                source_port, source_vpi, source_vci = map(int, match_source_pvc.group(1, 2, 3))
-                destination_port, destination_vpi, destination_vci = map(int, match_destination_pvc.group(1, 2, 3))
-                if self.has_port(destination_port):
-                    if (source_port, source_vpi, source_vci) not in self.mappings and \
-                       (destination_port, destination_vpi, destination_vci) not in self.mappings:
-                        yield from self.map_pvc(source_port, source_vpi, source_vci, destination_port, destination_vpi, destination_vci)
-                        yield from self.map_pvc(destination_port, destination_vpi, destination_vci, source_port, source_vpi, source_vci)
+                source_pvc = tuple(map(int, match_source_pvc.group(1, 2, 3)))
+                destination_pvc = tuple(map(int, match_destination_pvc.group(1, 2, 3)))
+                if self.has_port(destination_pvc[0]):
+                    if source_pvc not in self.mappings and destination_pvc not in self.mappings and \
+                       source_pvc not in queued and destination_pvc not in queued:
+                        pvcs.append(source_pvc + destination_pvc)
+                        pvcs.append(destination_pvc + source_pvc)
+                        queued.update((source_pvc, destination_pvc))
             else:
                 # add the virtual paths
-                source_port, source_vpi = map(int, source.split(':'))
-                destination_port, destination_vpi = map(int, destination.split(':'))
-                if self.has_port(destination_port):
-                    if (source_port, source_vpi) not in self.mappings and (destination_port, destination_vpi) not in self.mappings:
-                        yield from self.map_vp(source_port, source_vpi, destination_port, destination_vpi)
-                        yield from self.map_vp(destination_port, destination_vpi, source_port, source_vpi)
+                source_vp = tuple(map(int, source.split(':')))
+                destination_vp = tuple(map(int, destination.split(':')))
+                if self.has_port(destination_vp[0]):
+                    if source_vp not in self.mappings and destination_vp not in self.mappings and \
+                       source_vp not in queued and destination_vp not in queued:
+                        vps.append(source_vp + destination_vp)
+                        vps.append(destination_vp + source_vp)
+                        queued.update((source_vp, destination_vp))
+
+        # all the connections are sent to the hypervisor in one go
+        yield from self.map_pvc_bulk(pvcs)
+        yield from self.map_vp_bulk(vps)
+
+    def _check_ports(self, ports):
+        """
+        Checks that all the given ports are allocated on this ATM switch.
+
+        :param ports: iterable of port numbers
+        """
+
+        missing = self.validate_ports(ports)
+        if len(missing) == 1:
+            raise DynamipsError("Port {} is not allocated".format(missing.pop()))
+        if missing:
+            raise DynamipsError("Ports {} are not allocated".format(", ".join(str(port) for port in sorted(missing))))
+
+    @staticmethod
+    def _raise_first_error(results):
+        """
+        Raises the first error found in the results of a batch of commands.
+
+        :param results: list of results returned by send_many()
+        """
+
+        for result in results:
+            if isinstance(result, DynamipsError):
+                raise result
+
+    def _add_mapping(self, source, destination):
+        """
+        Records a connection and indexes it by its source port.
+
+        :param source: (port, vpi) or (port, vpi, vci) tuple
+        :param destination: (port, vpi) or (port, vpi, vci) tuple
+        """
+
+        if self._mappings is self._EMPTY:
+            self._mappings = {}
+            self._port_mappings = {}
+        self._mappings[source] = destination
+        self._port_mappings.setdefault(source[0], set()).add(source)
+
+    def _remove_mapping(self, source):
+        """
+        Forgets a connection.
+
+        :param source: (port, vpi) or (port, vpi, vci) tuple
+        """
+
+        del self._mappings[source]
+        sources = self._port_mappings[source[0]]
+        sources.discard(source)
+        if not sources:
+            del self._port_mappings[source[0]]
+
+    def _nio(self, port):
+        """
+        Returns the NIO allocated to a port.
+
+        :param port: port number
+
+        :returns: NIO instance
+        """
+
+        nio = self._nios.get(port)
+        if nio is None:
+            raise DynamipsError("Port {} is not allocated".format(port))
+        return nio
+
+    def _vpc_command(self, template, nio1, vpi1, nio2, vpi2):
+        """
+        Builds a Virtual Path connection command for the hypervisor.
+
+        :param template: _VPC_CREATE or _VPC_DELETE
+        :param nio1: input NIO
+        :param vpi1: input vpi
+        :param nio2: output NIO
+        :param vpi2: output vpi
+
+        :returns: hypervisor command (string)
+        """
+
+        return template % (self._name, nio1.name, vpi1, nio2.name, vpi2)
+
+    def _vcc_command(self, template, nio1, vpi1, vci1, nio2, vpi2, vci2):
+        """
+        Builds a Virtual Channel connection command for the hypervisor.
+
+        :param template: _VCC_CREATE or _VCC_DELETE
+        :param nio1: input NIO
+        :param vpi1: input vpi
+        :param vci1: input vci
+        :param nio2: output NIO
+        :param vpi2: output vpi
+        :param vci2: output vci
+
+        :returns: hypervisor command (string)
+        """
+
+        return template % (self._name, nio1.name, vpi1, vci1, nio2.name, vpi2, vci2)
+
+    @asyncio.coroutine
+    def _send_once(self, keys, commands):
+        """
+        Sends connection commands to the hypervisor in a single batch.
+        A command identical to one already in progress is not sent again,
+        the outcome of the pending one is awaited instead.
+
+        :param keys: keys identifying the connections
+        :param commands: hypervisor commands
+
+        :returns: list with, for each command, True if it has been sent by this call,
+        False if it has been sent by a concurrent call or the DynamipsError it raised
+        """
+
+        results = [None] * len(commands)
+        pending = list(range(len(commands)))
+        while pending:
+            if self._inflight is self._EMPTY:
+                self._inflight = {}
+            sending = {}
+            waiting = []
+            for index in pending:
+                future = self._inflight.get(keys[index])
+                if future is None:
+                    future = asyncio.Future()
+                    self._inflight[keys[index]] = future
+                    sending[index] = future
+                else:
+                    waiting.append((index, future))
+
+            if sending:
+                indexes = list(sending)
+                try:
+                    try:
+                        replies = yield from self._hypervisor.send_many([commands[index] for index in indexes],
+                                                                        return_exceptions=True)
+                    except DynamipsError as e:
+                        replies = [e] * len(indexes)
+                    for index, reply in zip(indexes, replies):
+                        results[index] = reply if isinstance(reply, DynamipsError) else True
+                        sending[index].set_result(results[index])
+                finally:
+                    for index, future in sending.items():
+                        del self._inflight[keys[index]]
+                        if not future.done():
+                            # this call has been cancelled, let the waiting calls send the command
+                            future.set_result(None)
+
+            pending = []
+            for index, future in waiting:
+                outcome = yield from asyncio.shield(future)
+                if outcome is None:
+                    pending.append(index)
+                elif outcome is True:
+                    results[index] = False
+                else:
+                    results[index] = outcome
+        return results
 
     @asyncio.coroutine
     def map_vp(self, port1, vpi1, port2, vpi2):
@@ -230,29 +433,43 @@ class ATMSwitch(Device):
         :param vpi2: output vpi
         """
 
-        if port1 not in self._nios:
-            raise DynamipsError("Port {} is not allocated".format(port1))
+        command = self._vpc_command(_VPC_CREATE, self._nio(port1), vpi1, self._nio(port2), vpi2)
+        result, = yield from self._send_once([(port1, vpi1, port2, vpi2)], [command])
+        if isinstance(result, DynamipsError):
+            raise result
+        if not result:
+            # an identical VPC has been created concurrently
+            return
 
-        if port2 not in self._nios:
-            raise DynamipsError("Port {} is not allocated".format(port2))
+        log.info('ATM switch "%s" [%s]: VPC from port %s VPI %s to port %s VPI %s created',
+                 self._name, self._id, port1, vpi1, port2, vpi2)
 
-        nio1 = self._nios[port1]
-        nio2 = self._nios[port2]
+        self._add_mapping((port1, vpi1), (port2, vpi2))
 
-        yield from self._hypervisor.send('atmsw create_vpc "{name}" {input_nio} {input_vpi} {output_nio} {output_vpi}'.format(name=self._name,
-                                                                                                                              input_nio=nio1,
-                                                                                                                              input_vpi=vpi1,
-                                                                                                                              output_nio=nio2,
-                                                                                                                              output_vpi=vpi2))
+    @asyncio.coroutine
+    def map_vp_bulk(self, entries):
+        """
+        Creates several Virtual Path connections with a single hypervisor round-trip.
 
-        log.info('ATM switch "{name}" [{id}]: VPC from port {port1} VPI {vpi1} to port {port2} VPI {vpi2} created'.format(name=self._name,
-                                                                                                                          id=self._id,
-                                                                                                                          port1=port1,
-                                                                                                                          vpi1=vpi1,
-                                                                                                                          port2=port2,
-                                                                                                                          vpi2=vpi2))
+        :param entries: list of (port1, vpi1, port2, vpi2) tuples
+        """
 
-        self._mappings[(port1, vpi1)] = (port2, vpi2)
+        if not entries:
+            return
+
+        self._check_ports({entry[0] for entry in entries} | {entry[2] for entry in entries})
+        # skip the connections created since the entries have been computed
+        entries = [tuple(entry) for entry in entries if self._mappings.get(tuple(entry[:2])) != tuple(entry[2:])]
+        nios = self._nios
+        commands = [self._vpc_command(_VPC_CREATE, nios[port1], vpi1, nios[port2], vpi2) for port1, vpi1, port2, vpi2 in entries]
+        results = yield from self._send_once(entries, commands)
+        created = 0
+        for (port1, vpi1, port2, vpi2), result in zip(entries, results):
+            if result is True:
+                self._add_mapping((port1, vpi1), (port2, vpi2))
+                created += 1
+        log.info('ATM switch "%s" [%s]: %s VPCs created', self._name, self._id, created)
+        self._raise_first_error(results)
 
     @asyncio.coroutine
     def unmap_vp(self, port1, vpi1, port2, vpi2):
@@ -265,29 +482,35 @@ class ATMSwitch(Device):
         :param vpi2: output vpi
         """
 
-        if port1 not in self._nios:
-            raise DynamipsError("Port {} is not allocated".format(port1))
+        yield from self._hypervisor.send(self._vpc_command(_VPC_DELETE, self._nio(port1), vpi1, self._nio(port2), vpi2))
 
-        if port2 not in self._nios:
-            raise DynamipsError("Port {} is not allocated".format(port2))
+        log.info('ATM switch "%s" [%s]: VPC from port %s VPI %s to port %s VPI %s deleted',
+                 self._name, self._id, port1, vpi1, port2, vpi2)
 
-        nio1 = self._nios[port1]
-        nio2 = self._nios[port2]
+        self._remove_mapping((port1, vpi1))
 
-        yield from self._hypervisor.send('atmsw delete_vpc "{name}" {input_nio} {input_vpi} {output_nio} {output_vpi}'.format(name=self._name,
-                                                                                                                              input_nio=nio1,
-                                                                                                                              input_vpi=vpi1,
-                                                                                                                              output_nio=nio2,
-                                                                                                                              output_vpi=vpi2))
+    @asyncio.coroutine
+    def unmap_vp_bulk(self, entries):
+        """
+        Deletes several Virtual Path connections with a single hypervisor round-trip.
 
-        log.info('ATM switch "{name}" [{id}]: VPC from port {port1} VPI {vpi1} to port {port2} VPI {vpi2} deleted'.format(name=self._name,
-                                                                                                                          id=self._id,
-                                                                                                                          port1=port1,
-                                                                                                                          vpi1=vpi1,
-                                                                                                                          port2=port2,
-                                                                                                                          vpi2=vpi2))
+        :param entries: list of (port1, vpi1, port2, vpi2) tuples
+        """
 
-        del self._mappings[(port1, vpi1)]
+        if not entries:
+            return
+
+        self._check_ports({entry[0] for entry in entries} | {entry[2] for entry in entries})
+        nios = self._nios
+        commands = [self._vpc_command(_VPC_DELETE, nios[port1], vpi1, nios[port2], vpi2) for port1, vpi1, port2, vpi2 in entries]
+        results = yield from self._hypervisor.send_many(commands, return_exceptions=True)
+        deleted = 0
+        for (port1, vpi1, _, _), result in zip(entries, results):
+            if not isinstance(result, DynamipsError):
+                self._remove_mapping((port1, vpi1))
+                deleted += 1
+        log.info('ATM switch "%s" [%s]: %s VPCs deleted', self._name, self._id, deleted)
+        self._raise_first_error(results)
 
     @asyncio.coroutine
     def map_pvc(self, port1, vpi1, vci1, port2, vpi2, vci2):
@@ -302,33 +525,45 @@ class ATMSwitch(Device):
         :param vci2: output vci
         """
 
-        if port1 not in self._nios:
-            raise DynamipsError("Port {} is not allocated".format(port1))
+        command = self._vcc_command(_VCC_CREATE, self._nio(port1), vpi1, vci1, self._nio(port2), vpi2, vci2)
+        result, = yield from self._send_once([(port1, vpi1, vci1, port2, vpi2, vci2)], [command])
+        if isinstance(result, DynamipsError):
+            raise result
+        if not result:
+            # an identical VCC has been created concurrently
+            return
 
-        if port2 not in self._nios:
-            raise DynamipsError("Port {} is not allocated".format(port2))
+        log.info('ATM switch "%s" [%s]: VCC from port %s VPI %s VCI %s to port %s VPI %s VCI %s created',
+                 self._name, self._id, port1, vpi1, vci1, port2, vpi2, vci2)
 
-        nio1 = self._nios[port1]
-        nio2 = self._nios[port2]
+        self._add_mapping((port1, vpi1, vci1), (port2, vpi2, vci2))
 
-        yield from self._hypervisor.send('atmsw create_vcc "{name}" {input_nio} {input_vpi} {input_vci} {output_nio} {output_vpi} {output_vci}'.format(name=self._name,
-                                                                                                                                                       input_nio=nio1,
-                                                                                                                                                       input_vpi=vpi1,
-                                                                                                                                                       input_vci=vci1,
-                                                                                                                                                       output_nio=nio2,
-                                                                                                                                                       output_vpi=vpi2,
-                                                                                                                                                       output_vci=vci2))
+    @asyncio.coroutine
+    def map_pvc_bulk(self, entries):
+        """
+        Creates several Virtual Channel connections (unidirectional)
+        with a single hypervisor round-trip.
 
-        log.info('ATM switch "{name}" [{id}]: VCC from port {port1} VPI {vpi1} VCI {vci1} to port {port2} VPI {vpi2} VCI {vci2} created'.format(name=self._name,
-                                                                                                                                                id=self._id,
-                                                                                                                                                port1=port1,
-                                                                                                                                                vpi1=vpi1,
-                                                                                                                                                vci1=vci1,
-                                                                                                                                                port2=port2,
-                                                                                                                                                vpi2=vpi2,
-                                                                                                                                                vci2=vci2))
+        :param entries: list of (port1, vpi1, vci1, port2, vpi2, vci2) tuples
+        """
 
-        self._mappings[(port1, vpi1, vci1)] = (port2, vpi2, vci2)
+        if not entries:
+            return
+
+        self._check_ports({entry[0] for entry in entries} | {entry[3] for entry in entries})
+        # skip the connections created since the entries have been computed
+        entries = [tuple(entry) for entry in entries if self._mappings.get(tuple(entry[:3])) != tuple(entry[3:])]
+        nios = self._nios
+        commands = [self._vcc_command(_VCC_CREATE, nios[port1], vpi1, vci1, nios[port2], vpi2, vci2)
+                    for port1, vpi1, vci1, port2, vpi2, vci2 in entries]
+        results = yield from self._send_once(entries, commands)
+        created = 0
+        for (port1, vpi1, vci1, port2, vpi2, vci2), result in zip(entries, results):
+            if result is True:
+                self._add_mapping((port1, vpi1, vci1), (port2, vpi2, vci2))
+                created += 1
+        log.info('ATM switch "%s" [%s]: %s VCCs created', self._name, self._id, created)
+        self._raise_first_error(results)
 
     @asyncio.coroutine
     def unmap_pvc(self, port1, vpi1, vci1, port2, vpi2, vci2):
@@ -343,32 +578,36 @@ class ATMSwitch(Device):
         :param vci2: output vci
         """
 
-        if port1 not in self._nios:
-            raise DynamipsError("Port {} is not allocated".format(port1))
+        yield from self._hypervisor.send(self._vcc_command(_VCC_DELETE, self._nio(port1), vpi1, vci1, self._nio(port2), vpi2, vci2))
 
-        if port2 not in self._nios:
-            raise DynamipsError("Port {} is not allocated".format(port2))
+        log.info('ATM switch "%s" [%s]: VCC from port %s VPI %s VCI %s to port %s VPI %s VCI %s deleted',
+                 self._name, self._id, port1, vpi1, vci1, port2, vpi2, vci2)
+        self._remove_mapping((port1, vpi1, vci1))
 
-        nio1 = self._nios[port1]
-        nio2 = self._nios[port2]
+    @asyncio.coroutine
+    def unmap_pvc_bulk(self, entries):
+        """
+        Deletes several Virtual Channel connections (unidirectional)
+        with a single hypervisor round-trip.
 
-        yield from self._hypervisor.send('atmsw delete_vcc "{name}" {input_nio} {input_vpi} {input_vci} {output_nio} {output_vpi} {output_vci}'.format(name=self._name,
-                                                                                                                                                       input_nio=nio1,
-                                                                                                                                                       input_vpi=vpi1,
-                                                                                                                                                       input_vci=vci1,
-                                                                                                                                                       output_nio=nio2,
-                                                                                                                                                       output_vpi=vpi2,
-                                                                                                                                                       output_vci=vci2))
+        :param entries: list of (port1, vpi1, vci1, port2, vpi2, vci2) tuples
+        """
 
-        log.info('ATM switch "{name}" [{id}]: VCC from port {port1} VPI {vpi1} VCI {vci1} to port {port2} VPI {vpi2} VCI {vci2} deleted'.format(name=self._name,
-                                                                                                                                                id=self._id,
-                                                                                                                                                port1=port1,
-                                                                                                                                                vpi1=vpi1,
-                                                                                                                                                vci1=vci1,
-                                                                                                                                                port2=port2,
-                                                                                                                                                vpi2=vpi2,
-                                                                                                                                                vci2=vci2))
-        del self._mappings[(port1, vpi1, vci1)]
+        if not entries:
+            return
+
+        self._check_ports({entry[0] for entry in entries} | {entry[3] for entry in entries})
+        nios = self._nios
+        commands = [self._vcc_command(_VCC_DELETE, nios[port1], vpi1, vci1, nios[port2], vpi2, vci2)
+                    for port1, vpi1, vci1, port2, vpi2, vci2 in entries]
+        results = yield from self._hypervisor.send_many(commands, return_exceptions=True)
+        deleted = 0
+        for (port1, vpi1, vci1, _, _, _), result in zip(entries, results):
+            if not isinstance(result, DynamipsError):
+                self._remove_mapping((port1, vpi1, vci1))
+                deleted += 1
+        log.info('ATM switch "%s" [%s]: %s VCCs deleted', self._name, self._id, deleted)
+        self._raise_first_error(results)
 
     @asyncio.coroutine
     def start_capture(self, port_number, output_file, data_link_type="DLT_ATM_RFC1483"):
@@ -380,24 +619,22 @@ class ATMSwitch(Device):
         :param data_link_type: PCAP data link type (DLT_*), default is DLT_ATM_RFC1483
         """
 
-        if port_number not in self._nios:
+        nio = self._nios.get(port_number)
+        if nio is None:
             raise DynamipsError("Port {} is not allocated".format(port_number))
 
-        nio = self._nios[port_number]
+        link_type = _DLT_NAMES.get(data_link_type)
+        if link_type is None:
+            link_type = data_link_type.lower()
+            if link_type.startswith("dlt_"):
+                link_type = link_type[4:]
 
-        data_link_type = data_link_type.lower()
-        if data_link_type.startswith("dlt_"):
-            data_link_type = data_link_type[4:]
-
-        if nio.input_filter[0] is not None and nio.output_filter[0] is not None:
+        if nio.filters_applied:
             raise DynamipsError("Port {} has already a filter applied".format(port_number))
 
-        yield from nio.bind_filter("both", "capture")
-        yield from nio.setup_filter("both", '{} "{}"'.format(data_link_type, output_file))
+        yield from nio.bind_and_setup_filter("both", "capture", '{} "{}"'.format(link_type, output_file))
 
-        log.info('ATM switch "{name}" [{id}]: starting packet capture on port {port}'.format(name=self._name,
-                                                                                             id=self._id,
-                                                                                             port=port_number))
+        log.info('ATM switch "%s" [%s]: starting packet capture on port %s', self._name, self._id, port_number)
 
     @asyncio.coroutine
     def stop_capture(self, port_number):
@@ -407,11 +644,8 @@ class ATMSwitch(Device):
         :param port_number: allocated port number
         """
 
-        if port_number not in self._nios:
+        nio = self._nios.get(port_number)
+        if nio is None:
             raise DynamipsError("Port {} is not allocated".format(port_number))
-
-        nio = self._nios[port_number]
         yield from nio.unbind_filter("both")
-        log.info('ATM switch "{name}" [{id}]: stopping packet capture on port {port}'.format(name=self._name,
-                                                                                             id=self._id,
-                                                                                             port=port_number))
+        log.info('ATM switch "%s" [%s]: stopping packet capture on port %s', self._name, self._id, port_number)
@@ -49,7 +49,7 @@ class Bridge(Device):
             self._hypervisor = yield from self.manager.start_new_hypervisor(working_dir=module_workdir)
 
         yield from self._hypervisor.send('nio_bridge create "{}"'.format(self._name))
-        self._hypervisor.devices.append(self)
+        self._hypervisor.devices.add(self)
 
     @asyncio.coroutine
     def set_name(self, new_name):
@@ -80,8 +80,8 @@ class Bridge(Device):
         Deletes this bridge.
         """
 
-        if self._hypervisor and self in self._hypervisor.devices:
-            self._hypervisor.devices.remove(self)
+        if self._hypervisor:
+            self._hypervisor.devices.discard(self)
         if self._hypervisor and not self._hypervisor.devices:
             yield from self._hypervisor.send('nio_bridge delete "{}"'.format(self._name))
 
@@ -28,6 +28,8 @@ class Device:
     :param hypervisor: Dynamips hypervisor instance
     """
 
+    __slots__ = ("_name", "_id", "_project", "_manager", "_hypervisor")
+
     def __init__(self, name, device_id, project, manager, hypervisor=None):
 
         self._name = name
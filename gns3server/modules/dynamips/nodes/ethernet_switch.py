@@ -73,7 +73,7 @@ class EthernetSwitch(Device):
 
         yield from self._hypervisor.send('ethsw create "{}"'.format(self._name))
         log.info('Ethernet switch "{name}" [{id}] has been created'.format(name=self._name, id=self._id))
-        self._hypervisor.devices.append(self)
+        self._hypervisor.devices.add(self)
 
     @asyncio.coroutine
     def set_name(self, new_name):
@@ -124,8 +124,8 @@ class EthernetSwitch(Device):
             log.info('Ethernet switch "{name}" [{id}] has been deleted'.format(name=self._name, id=self._id))
         except DynamipsError:
             log.debug("Could not properly delete Ethernet switch {}".format(self._name))
-        if self._hypervisor and self in self._hypervisor.devices:
-            self._hypervisor.devices.remove(self)
+        if self._hypervisor:
+            self._hypervisor.devices.discard(self)
         if self._hypervisor and not self._hypervisor.devices:
             yield from self.hypervisor.stop()
 
@@ -206,7 +206,7 @@ class Router(BaseVM):
                                                                                                   name=self._name))
             self._mac_addr = mac_addr[0]
 
-        self._hypervisor.devices.append(self)
+        self._hypervisor.devices.add(self)
 
     @asyncio.coroutine
     def get_status(self):
@@ -331,8 +331,7 @@ class Router(BaseVM):
                     if nio and isinstance(nio, NIOUDP):
                         self.manager.port_manager.release_udp_port(nio.lport, self._project)
 
-        if self in self._hypervisor.devices:
-            self._hypervisor.devices.remove(self)
+        self._hypervisor.devices.discard(self)
         if self._hypervisor and not self._hypervisor.devices:
             try:
                 yield from self.stop()
@@ -1541,5 +1540,5 @@ class Router(BaseVM):
         """
 
         yield from self._hypervisor.send('vm clean_delete "{}"'.format(self._name))
-        self._hypervisor.devices.remove(self)
+        self._hypervisor.devices.discard(self)
         log.info('Router "{name}" [{id}] has been deleted (including associated files)'.format(name=self._name, id=self._id))
@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+import asyncio
+
+from unittest.mock import MagicMock
+
+from gns3server.modules.dynamips.nodes.atm_switch import ATMSwitch
+from gns3server.modules.dynamips.nios.nio import NIO
+from gns3server.modules.dynamips.dynamips_error import DynamipsError
+
+
+class FakeHypervisor:
+
+    """
+    Records the commands and fails the ones listed in failing.
+    Replies are held until gate is done when it is set.
+    """
+
+    def __init__(self):
+        self.devices = set()
+        self.commands = []
+        self.failing = set()
+        self.gate = None
+        self.stopped = False
+
+    @asyncio.coroutine
+    def send(self, command):
+        results = yield from self.send_many([command])
+        return results[0]
+
+    @asyncio.coroutine
+    def send_many(self, commands, return_exceptions=False):
+        self.commands.extend(commands)
+        if self.gate is not None:
+            yield from asyncio.shield(self.gate)
+        results = []
+        for command in commands:
+            if command in self.failing:
+                results.append(DynamipsError("failed"))
+            else:
+                results.append([])
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, DynamipsError):
+                    raise result
+        return results
+
+    @asyncio.coroutine
+    def stop(self):
+        self.stopped = True
+
+
+@pytest.fixture(scope="function")
+def hypervisor():
+    return FakeHypervisor()
+
+
+@pytest.fixture(scope="function")
+def atm_switch(hypervisor):
+    atm_switch = ATMSwitch("test", "00010203-0405-0607-0809-0a0b0c0d0e0f", None, None, hypervisor)
+    atm_switch.add_nio(NIO("nio1", hypervisor), 1)
+    atm_switch.add_nio(NIO("nio2", hypervisor), 2)
+    return atm_switch
+
+
+def test_set_mappings(atm_switch, hypervisor, loop):
+
+    loop.run_until_complete(atm_switch.set_mappings({"1:10:100": "2:20:200", "2:20:200": "1:10:100", "1:5": "2:6"}))
+    assert hypervisor.commands == ['atmsw create_vcc "test" nio1 10 100 nio2 20 200',
+                                   'atmsw create_vcc "test" nio2 20 200 nio1 10 100',
+                                   'atmsw create_vpc "test" nio1 5 nio2 6',
+                                   'atmsw create_vpc "test" nio2 6 nio1 5']
+    assert atm_switch.mappings == {(1, 10, 100): (2, 20, 200),
+                                   (2, 20, 200): (1, 10, 100),
+                                   (1, 5): (2, 6),
+                                   (2, 6): (1, 5)}
+
+
+def test_validate_ports(atm_switch):
+
+    assert atm_switch.validate_ports([1, 2, 1]) == set()
+    assert atm_switch.validate_ports([1, 3, 3, 4]) == {3, 4}
+    assert atm_switch.validate_ports([]) == set()
+
+
+def test_validate_ports_fresh_switch(hypervisor):
+
+    atm_switch = ATMSwitch("test", "00010203-0405-0607-0809-0a0b0c0d0e0f", None, None, hypervisor)
+    assert atm_switch.validate_ports([1, 2, 2]) == {1, 2}
+    assert atm_switch.validate_ports([]) == set()
+
+
+def test_fresh_switch(hypervisor, loop):
+
+    project = MagicMock()
+    project.id = "a1e920ca-338a-4e9f-b363-aa607b09dd80"
+    atm_switch = ATMSwitch("test", "00010203-0405-0607-0809-0a0b0c0d0e0f", project, None, hypervisor)
+    json = atm_switch.__json__()
+    assert json["mappings"] == {}
+    assert type(json["mappings"]) is dict
+
+    # the shared empty tables cannot be modified through the properties
+    with pytest.raises(TypeError):
+        atm_switch.nios[1] = NIO("nio1", hypervisor)
+    with pytest.raises(TypeError):
+        atm_switch.mappings[(1, 5)] = (2, 6)
+    with pytest.raises(DynamipsError):
+        loop.run_until_complete(atm_switch.remove_nio(1))
+
+    other = ATMSwitch("other", "10010203-0405-0607-0809-0a0b0c0d0e0f", project, None, hypervisor)
+    other.add_nio(NIO("nio1", hypervisor), 1)
+    assert not atm_switch.has_port(1)
+    assert atm_switch.nios == {}
+
+    loop.run_until_complete(atm_switch.delete())
+    assert hypervisor.commands == ['atmsw delete "test"']
+    assert hypervisor.stopped
+
+
+def test_map_pvc_bulk_error(atm_switch, hypervisor, loop):
+
+    hypervisor.failing.add('atmsw create_vcc "test" nio1 30 300 nio2 40 400')
+    with pytest.raises(DynamipsError):
+        loop.run_until_complete(atm_switch.map_pvc_bulk([(1, 10, 100, 2, 20, 200),
+                                                         (2, 20, 200, 1, 10, 100),
+                                                         (1, 30, 300, 2, 40, 400),
+                                                         (2, 40, 400, 1, 30, 300)]))
+
+    # the connections created before and after the failure are recorded
+    assert atm_switch.mappings == {(1, 10, 100): (2, 20, 200),
+                                   (2, 20, 200): (1, 10, 100),
+                                   (2, 40, 400): (1, 30, 300)}
+
+
+def test_map_pvc_bulk_not_allocated(atm_switch, hypervisor, loop):
+
+    with pytest.raises(DynamipsError) as e:
+        loop.run_until_complete(atm_switch.map_pvc_bulk([(1, 10, 100, 3, 20, 200),
+                                                         (4, 20, 200, 1, 10, 100)]))
+    assert str(e.value) == "Ports 3, 4 are not allocated"
+    assert hypervisor.commands == []
+
+
+def test_unmap_bulk_not_allocated(atm_switch, hypervisor, loop):
+
+    loop.run_until_complete(atm_switch.set_mappings({"1:10:100": "2:20:200", "1:5": "2:6"}))
+    del hypervisor.commands[:]
+    with pytest.raises(DynamipsError) as e:
+        loop.run_until_complete(atm_switch.unmap_pvc_bulk([(1, 10, 100, 2, 20, 200),
+                                                           (1, 30, 300, 3, 40, 400)]))
+    assert str(e.value) == "Port 3 is not allocated"
+    with pytest.raises(DynamipsError):
+        loop.run_until_complete(atm_switch.unmap_vp_bulk([(1, 5, 2, 6), (3, 7, 1, 8)]))
+
+    # nothing has been sent and the connections are still recorded
+    assert hypervisor.commands == []
+    assert len(atm_switch.mappings) == 4
+
+
+def test_remove_nio(atm_switch, hypervisor, loop):
+
+    loop.run_until_complete(atm_switch.set_mappings({"1:10:100": "2:20:200", "1:5": "2:6"}))
+    nio = loop.run_until_complete(atm_switch.remove_nio(1))
+    assert nio.name == "nio1"
+    assert not atm_switch.has_port(1)
+    assert atm_switch.mappings == {}
+    assert 'atmsw delete_vcc "test" nio1 10 100 nio2 20 200' in hypervisor.commands
+    assert 'atmsw delete_vpc "test" nio2 6 nio1 5' in hypervisor.commands
+
+
+def test_remove_nio_error(atm_switch, hypervisor, loop):
+
+    loop.run_until_complete(atm_switch.set_mappings({"1:10:100": "2:20:200", "1:30:300": "2:40:400"}))
+    hypervisor.failing.add('atmsw delete_vcc "test" nio1 30 300 nio2 40 400')
+    with pytest.raises(DynamipsError):
+        loop.run_until_complete(atm_switch.remove_nio(1))
+
+    # only the connection that could not be deleted is still recorded
+    assert atm_switch.has_port(1)
+    assert atm_switch.mappings == {(1, 30, 300): (2, 40, 400)}
+    hypervisor.failing.clear()
+    loop.run_until_complete(atm_switch.remove_nio(1))
+    assert atm_switch.mappings == {}
+
+
+def test_remove_nio_same_port(atm_switch, hypervisor, loop):
+
+    loop.run_until_complete(atm_switch.set_mappings({"1:10:100": "1:20:200"}))
+    loop.run_until_complete(atm_switch.remove_nio(1))
+    assert atm_switch.mappings == {}
+    assert len([command for command in hypervisor.commands if "delete_vcc" in command]) == 2
+
+
+def test_remove_nio_identity(atm_switch, hypervisor, loop):
+
+    loop.run_until_complete(atm_switch.set_mappings({"1:10:100": "1:10:100", "1:5": "1:5"}))
+    assert atm_switch.mappings == {(1, 10, 100): (1, 10, 100), (1, 5): (1, 5)}
+    loop.run_until_complete(atm_switch.remove_nio(1))
+    assert not atm_switch.has_port(1)
+    assert atm_switch.mappings == {}
+    assert [command for command in hypervisor.commands if "delete" in command] == \
+        ['atmsw delete_vcc "test" nio1 10 100 nio1 10 100',
+         'atmsw delete_vpc "test" nio1 5 nio1 5']
+
+
+def test_start_capture(atm_switch, hypervisor, loop):
+
+    loop.run_until_complete(atm_switch.start_capture(1, "/tmp/test.pcap"))
+    assert hypervisor.commands == ["nio bind_filter nio1 2 capture",
+                                   'nio setup_filter nio1 2 atm_rfc1483 "/tmp/test.pcap"']
+    nio = atm_switch.nios[1]
+    assert nio.filters_applied
+    assert nio.input_filter == ("capture", 'atm_rfc1483 "/tmp/test.pcap"')
+
+    with pytest.raises(DynamipsError):
+        loop.run_until_complete(atm_switch.start_capture(1, "/tmp/test.pcap"))
+
+
+@pytest.mark.parametrize("data_link_type, link_type", [("DLT_EN10MB", "en10mb"),
+                                                         ("DLT_PPP_SERIAL", "ppp_serial"),
+                                                         ("dlt_foo", "foo"),
+                                                         ("DLT_FOO", "foo"),
+                                                         ("Raw", "raw")])
+def test_start_capture_data_link_type(atm_switch, hypervisor, loop, data_link_type, link_type):
+
+    loop.run_until_complete(atm_switch.start_capture(1, "/tmp/test.pcap", data_link_type))
+    assert hypervisor.commands == ["nio bind_filter nio1 2 capture",
+                                   'nio setup_filter nio1 2 {} "/tmp/test.pcap"'.format(link_type)]
+
+
+def test_start_capture_setup_error(atm_switch, hypervisor, loop):
+
+    hypervisor.failing.add('nio setup_filter nio1 2 atm_rfc1483 "/tmp/test.pcap"')
+    with pytest.raises(DynamipsError):
+        loop.run_until_complete(atm_switch.start_capture(1, "/tmp/test.pcap"))
+
+    # the capture filter has been bound and must be unbound on deletion
+    nio = atm_switch.nios[1]
+    assert nio.filters_applied
+    assert nio.input_filter == ("capture", None)
+    loop.run_until_complete(nio.delete())
+    assert hypervisor.commands[-2:] == ["nio unbind_filter nio1 2", "nio delete nio1"]
+
+
+def _wait_for_commands(hypervisor, loop, count):
+
+    while len(hypervisor.commands) < count:
+        loop.run_until_complete(asyncio.sleep(0))
+
+
+def test_map_pvc_coalesced(atm_switch, hypervisor, loop):
+
+    hypervisor.gate = asyncio.Future()
+    tasks = [loop.create_task(atm_switch.map_pvc(1, 1, 1, 2, 2, 2)) for _ in range(2)]
+    _wait_for_commands(hypervisor, loop, 1)
+    hypervisor.gate.set_result(True)
+    loop.run_until_complete(asyncio.wait(tasks))
+    assert [task.result() for task in tasks] == [None, None]
+    assert hypervisor.commands == ['atmsw create_vcc "test" nio1 1 1 nio2 2 2']
+    assert atm_switch.mappings == {(1, 1, 1): (2, 2, 2)}
+
+
+def test_map_pvc_coalesced_error(atm_switch, hypervisor, loop):
+
+    hypervisor.gate = asyncio.Future()
+    hypervisor.failing.add('atmsw create_vcc "test" nio1 1 1 nio2 2 2')
+    tasks = [loop.create_task(atm_switch.map_pvc(1, 1, 1, 2, 2, 2)) for _ in range(2)]
+    _wait_for_commands(hypervisor, loop, 1)
+    hypervisor.gate.set_result(True)
+    loop.run_until_complete(asyncio.wait(tasks))
+    for task in tasks:
+        assert isinstance(task.exception(), DynamipsError)
+    assert len(hypervisor.commands) == 1
+    assert atm_switch.mappings == {}
+
+
+def test_map_pvc_coalesced_cancelled(atm_switch, hypervisor, loop):
+
+    hypervisor.gate = asyncio.Future()
+    first = loop.create_task(atm_switch.map_pvc(1, 1, 1, 2, 2, 2))
+    second = loop.create_task(atm_switch.map_pvc(1, 1, 1, 2, 2, 2))
+    _wait_for_commands(hypervisor, loop, 1)
+    loop.run_until_complete(asyncio.sleep(0))
+    first.cancel()
+
+    # the waiting call sends the command again instead of being cancelled
+    _wait_for_commands(hypervisor, loop, 2)
+    hypervisor.gate.set_result(True)
+    loop.run_until_complete(asyncio.wait([first, second]))
+    assert first.cancelled()
+    assert second.result() is None
+    assert atm_switch.mappings == {(1, 1, 1): (2, 2, 2)}
+
+
+def test_set_mappings_coalesced(atm_switch, hypervisor, loop):
+
+    hypervisor.gate = asyncio.Future()
+    mappings = {"1:10:100": "2:20:200", "1:5": "2:6"}
+    tasks = [loop.create_task(atm_switch.set_mappings(mappings)) for _ in range(2)]
+    _wait_for_commands(hypervisor, loop, 2)
+    loop.run_until_complete(asyncio.sleep(0))
+    hypervisor.gate.set_result(True)
+    loop.run_until_complete(asyncio.wait(tasks))
+    assert [task.result() for task in tasks] == [None, None]
+    assert sorted(hypervisor.commands) == ['atmsw create_vcc "test" nio1 10 100 nio2 20 200',
+                                           'atmsw create_vcc "test" nio2 20 200 nio1 10 100',
+                                           'atmsw create_vpc "test" nio1 5 nio2 6',
+                                           'atmsw create_vpc "test" nio2 6 nio1 5']
+    assert atm_switch.mappings == {(1, 10, 100): (2, 20, 200),
+                                   (2, 20, 200): (1, 10, 100),
+                                   (1, 5): (2, 6),
+                                   (2, 6): (1, 5)}
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2015 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+import asyncio
+
+from unittest.mock import patch
+
+from gns3server.modules.dynamips.dynamips_hypervisor import DynamipsHypervisor
+from gns3server.modules.dynamips.dynamips_error import DynamipsError
+
+
+class FakeWriter:
+
+    def __init__(self):
+        self.data = b""
+
+    def write(self, data):
+        self.data += data
+
+    @asyncio.coroutine
+    def drain(self):
+        pass
+
+
+@pytest.fixture(scope="function")
+def hypervisor(loop):
+    hypervisor = DynamipsHypervisor("/tmp", "127.0.0.1")
+    hypervisor._reader = asyncio.StreamReader(loop=loop)
+    hypervisor._writer = FakeWriter()
+    return hypervisor
+
+
+def test_send(hypervisor, loop):
+
+    hypervisor._reader.feed_data(b"101 line1\r\n100-line2\r\n")
+    assert loop.run_until_complete(hypervisor.send("nio list")) == ["line1", "line2"]
+    assert hypervisor._writer.data == b"nio list\n"
+
+
+def test_send_bytes(hypervisor, loop):
+
+    hypervisor._reader.feed_data(b"100-OK\r\n")
+    assert loop.run_until_complete(hypervisor.send(b"nio list ")) == []
+    assert hypervisor._writer.data == b"nio list\n"
+
+
+def test_send_many(hypervisor, loop):
+
+    hypervisor._reader.feed_data(b"100-OK\r\n101 line1\r\n100-line2\r\n100-OK\r\n")
+    results = loop.run_until_complete(hypervisor.send_many(["cmd1", "cmd2 ", "cmd3"]))
+    assert results == [[], ["line1", "line2"], []]
+    assert hypervisor._writer.data == b"cmd1\ncmd2\ncmd3\n"
+
+
+def test_send_many_bytes(hypervisor, loop):
+
+    hypervisor._reader.feed_data(b"100-OK\r\n100-OK\r\n")
+    assert loop.run_until_complete(hypervisor.send_many([b"cmd1", "cmd2"])) == [[], []]
+    assert hypervisor._writer.data == b"cmd1\ncmd2\n"
+
+
+def test_send_log(hypervisor, loop):
+
+    hypervisor._reader.feed_data(b"100-OK\r\n")
+    with patch("gns3server.modules.dynamips.dynamips_hypervisor.log") as mock_log:
+        loop.run_until_complete(hypervisor.send("nio list"))
+        mock_log.debug.assert_any_call("sending %s", "nio list")
+
+
+def test_send_many_log(hypervisor, loop):
+
+    hypervisor._reader.feed_data(b"100-OK\r\n100-OK\r\n")
+    with patch("gns3server.modules.dynamips.dynamips_hypervisor.log") as mock_log:
+        loop.run_until_complete(hypervisor.send_many(["cmd1", "cmd2"]))
+        mock_log.debug.assert_any_call("sending %s", ["cmd1", "cmd2"])
+
+
+def test_send_many_error(hypervisor, loop):
+
+    hypervisor._reader.feed_data(b"100-OK\r\n209-unknown NIO\r\n100-OK\r\n")
+    with pytest.raises(DynamipsError):
+        loop.run_until_complete(hypervisor.send_many(["cmd1", "cmd2", "cmd3"]))
+
+    # the replies to the commands after the error have been drained
+    hypervisor._reader.feed_data(b"100-next\r\n")
+    assert loop.run_until_complete(hypervisor.send("cmd4")) == ["next"]
+
+
+def test_send_many_return_exceptions(hypervisor, loop):
+
+    hypervisor._reader.feed_data(b"100-OK\r\n209-unknown NIO\r\n101 line1\r\n100-line2\r\n")
+    results = loop.run_until_complete(hypervisor.send_many(["cmd1", "cmd2", "cmd3"], return_exceptions=True))
+    assert results[0] == []
+    assert isinstance(results[1], DynamipsError)
+    assert str(results[1]) == "unknown NIO"
+    assert results[2] == ["line1", "line2"]
+
+
+def test_send_many_no_command(hypervisor, loop):
+
+    assert loop.run_until_complete(hypervisor.send_many([])) == []
+    assert hypervisor._writer.data == b""